@@ -1,89 +1,603 @@
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+
+    def njit(*args, **kwargs):
+        """
+        Stands in for numba.njit when Numba is not installed, so the kernels run as plain Python.
+        """
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+EXACT, LOWER, UPPER = 0, 1, 2
+# Bound for the integer alpha/beta window of the compiled search.
+INF = 1 << 30
+# Utility of a state where the player (or, negated, the opponent) has reached the goal.
+WIN = 1 << 20
+# Half-width of the Alpha-Beta window around the previous iteration's value.
+ASPIRATION_WINDOW = 2
+# Number of slots of a transposition table, a power of two. Each slot holds one entry.
+TT_CAPACITY = 1 << 16
+# Offsets of the fields of a transposition table slot, and the number of ints in a slot.
+TT_KEY, TT_VALUE, TT_FLAG, TT_DEPTH, TT_MOVE, TT_SLOT = 0, 1, 2, 3, 4, 5
+# Maze map directions and the (row, col) step they open onto; only used to build the neighbor tables.
+DIRECTIONS = (('E', (0, 1)), ('W', (0, -1)), ('N', (-1, 0)), ('S', (1, 0)))
+
+
+def _kernel_array(values, dtype='int64'):
+    """
+    Converts a list of ints to the array type the kernels are run with.
+
+    Args:
+    values (list): The values to convert.
+    dtype (str): The NumPy integer type of the array.
+
+    Returns:
+    The values as a contiguous NumPy array, or the list itself without Numba.
+    """
+    if np is None:
+        return values
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def _new_table(capacity):
+    """
+    Creates an empty transposition table.
+
+    The table is a flat run of TT_SLOT ints per slot, and a state hashes to a bucket of two
+    neighboring slots, so it never grows past capacity slots and every lookup is two probes.
+
+    Args:
+    capacity (int): The number of slots, a power of two.
+
+    Returns:
+    list: The table, with the depth and best move of every empty slot set to -1.
+    """
+    return [0, 0, EXACT, -1, -1] * capacity
+
+
+@njit(cache=True)
+def _tt_probe(tt, key, depth):
+    """
+    Finds the slot of a state in a transposition table made by _new_table.
+
+    Args:
+    tt (list): The transposition table, or its kernel array.
+    key (int): The state hash.
+    depth (int): The depth of the search the entry should answer.
+
+    Returns:
+    int: The offset of the slot of the state searched to depth, else of any slot of the state, or -1.
+    """
+    first = (key & (len(tt) // (2 * TT_SLOT) - 1)) * (2 * TT_SLOT)
+    second = first + TT_SLOT
+    if tt[first + TT_KEY] == key and (tt[first + TT_DEPTH] == depth or tt[second + TT_KEY] != key):
+        return first
+    if tt[second + TT_KEY] == key:
+        return second
+    return -1
+
+
+@njit(cache=True)
+def _tt_store(tt, key, value, flag, depth, best_move):
+    """
+    Stores an entry in the bucket of its state in a transposition table made by _new_table.
+
+    The first slot of a bucket is depth-preferred: it is only replaced by a search at least as deep.
+    Anything else goes to the second slot, which always takes the newest entry.
+
+    Args:
+    tt (list): The transposition table, or its kernel array.
+    key (int): The state hash.
+    value (int): The value of the state.
+    flag (int): EXACT, LOWER or UPPER for an exact value or a lower or upper bound.
+    depth (int): The number of plies searched below the state.
+    best_move (int): The cell id of the best move found, or -1.
+    """
+    slot = (key & (len(tt) // (2 * TT_SLOT) - 1)) * (2 * TT_SLOT)
+    if tt[slot + TT_DEPTH] > depth:
+        slot += TT_SLOT
+    tt[slot + TT_KEY] = key
+    tt[slot + TT_VALUE] = value
+    tt[slot + TT_FLAG] = flag
+    tt[slot + TT_DEPTH] = depth
+    tt[slot + TT_MOVE] = best_move
+
+
+# The same functions for the list tables of Minimax and the root, which stay in Python.
+_tt_probe_py = getattr(_tt_probe, 'py_func', _tt_probe)
+_tt_store_py = getattr(_tt_store, 'py_func', _tt_store)
+
+
+@njit(cache=True)
+def _alpha_beta(player, opponent, state_hash, depth, alpha, beta, is_max_turn, depth_limit, indptr, indices,
+                zob_player, zob_opponent, zob_side, dist, goal_id, tt, killers):
+    """
+    Alpha-Beta search over the CSR adjacency (indptr, indices). See GameSearch.alpha_beta_pruning.
+
+    Neighbors are stored nearest-to-goal first, so moves are searched in that order after the
+    transposition table's best move and the killer move of the ply, without building a move list.
+    killers[depth] is the last move that caused a cutoff at that depth. One ply above the depth limit
+    the children are leaves and are evaluated in the loop from dist instead of getting frames of their own.
+
+    The recursion runs on an explicit stack with one frame per ply, held in the f_* lists and indexed
+    by depth. next_index[d] is the next k of the move loop of the frame at depth d, where
+    k == start - 2 stands for the hint and k == start - 1 for the killer, then the stored neighbors follow.
+    """
+    size = depth_limit + 1
+    f_player = [0] * size
+    f_opponent = [0] * size
+    f_hash = [0] * size
+    f_max = [False] * size
+    f_alpha = [0] * size
+    f_beta = [0] * size
+    f_alpha_orig = [0] * size
+    f_beta_orig = [0] * size
+    f_best_value = [0] * size
+    f_best_move = [0] * size
+    f_move = [0] * size
+    f_hint = [0] * size
+    f_killer = [0] * size
+    f_start = [0] * size
+    f_end = [0] * size
+    next_index = [0] * size
+    root_depth = depth
+    top = depth - 1
+    value = 0
+    while True:
+        # Enter the node: it either has a value right away or becomes the frame of its depth.
+        depth_remaining = depth_limit - depth
+        alpha_orig, beta_orig = alpha, beta
+        hint = -1
+        has_value = False
+        slot = _tt_probe(tt, state_hash, depth_remaining)
+        if slot >= 0:
+            hint = tt[slot + TT_MOVE]
+            if tt[slot + TT_DEPTH] == depth_remaining:
+                entry_value, flag = tt[slot + TT_VALUE], tt[slot + TT_FLAG]
+                if flag == EXACT:
+                    value, has_value = entry_value, True
+                elif flag == LOWER:
+                    alpha = max(alpha, entry_value)
+                else:
+                    beta = min(beta, entry_value)
+                if alpha >= beta:
+                    value, has_value = entry_value, True
+
+        if has_value:
+            pass
+        elif player == goal_id:
+            value, has_value = WIN, True
+        elif opponent == goal_id:
+            value, has_value = -WIN, True
+        elif depth == depth_limit:
+            value, has_value = dist[opponent] - dist[player], True
+        else:
+            mover = player if is_max_turn else opponent
+            start, end = indptr[mover], indptr[mover + 1]
+            killer = killers[depth]
+            hint_legal = False
+            killer_legal = False
+            for k in range(start, end):
+                if indices[k] == hint:
+                    hint_legal = True
+                if indices[k] == killer:
+                    killer_legal = True
+            if not hint_legal:
+                hint = -1
+            if not killer_legal or killer == hint:
+                killer = -1
+            top = depth
+            f_player[top], f_opponent[top], f_hash[top], f_max[top] = player, opponent, state_hash, is_max_turn
+            f_alpha[top], f_beta[top], f_alpha_orig[top], f_beta_orig[top] = alpha, beta, alpha_orig, beta_orig
+            f_best_value[top] = -INF if is_max_turn else INF
+            f_best_move[top] = -1
+            f_hint[top], f_killer[top] = hint, killer
+            f_start[top], f_end[top] = start, end
+            next_index[top] = start - 2
+
+        # Fold finished values into their frames until a frame has a child left to search.
+        descend = False
+        while top >= root_depth:
+            f = top
+            if has_value:
+                move = f_move[f]
+                if f_max[f]:
+                    if value > f_best_value[f]:
+                        f_best_value[f], f_best_move[f] = value, move
+                    f_alpha[f] = max(f_alpha[f], value)
+                else:
+                    if value < f_best_value[f]:
+                        f_best_value[f], f_best_move[f] = value, move
+                    f_beta[f] = min(f_beta[f], value)
+                has_value = False
+                if f_beta[f] <= f_alpha[f]:
+                    killers[f] = move
+                    next_index[f] = f_end[f]
+
+            start, end = f_start[f], f_end[f]
+            k = next_index[f]
+            move = -1
+            while k < end:
+                if k == start - 2:
+                    move = f_hint[f]
+                elif k == start - 1:
+                    move = f_killer[f]
+                else:
+                    move = indices[k]
+                    if move == f_hint[f] or move == f_killer[f]:
+                        move = -1
+                k += 1
+                if move != -1:
+                    break
+            next_index[f] = k
+
+            if move == -1:
+                best_value = f_best_value[f]
+                if best_value <= f_alpha_orig[f]:
+                    flag = UPPER
+                elif best_value >= f_beta_orig[f]:
+                    flag = LOWER
+                else:
+                    flag = EXACT
+                _tt_store(tt, f_hash[f], best_value, flag, depth_limit - f, f_best_move[f])
+                value, has_value = best_value, True
+                top -= 1
+                continue
+
+            f_move[f] = move
+            player, opponent = f_player[f], f_opponent[f]
+            if f_max[f]:
+                if depth_limit - f == 1:
+                    value, has_value = (WIN if move == goal_id else dist[opponent] - dist[move]), True
+                else:
+                    state_hash = f_hash[f] ^ zob_player[player] ^ zob_player[move] ^ zob_side
+                    player, is_max_turn = move, False
+            else:
+                if depth_limit - f == 1:
+                    value, has_value = (-WIN if move == goal_id else dist[move] - dist[player]), True
+                else:
+                    state_hash = f_hash[f] ^ zob_opponent[opponent] ^ zob_opponent[move] ^ zob_side
+                    opponent, is_max_turn = move, True
+            if not has_value:
+                alpha, beta, depth = f_alpha[f], f_beta[f], f + 1
+                descend = True
+                break
+        if not descend:
+            return value
+
+
+# The GameSearch copy of a worker process started by GameSearch._search_moves_parallel.
+_worker_search = None
+
+
+def _init_worker(search):
+    """
+    Installs the GameSearch copy a worker process searches with.
+
+    Args:
+    search (GameSearch): The unpickled search object.
+    """
+    global _worker_search
+    _worker_search = search
+
+
+def _search_child(algorithm, move, opponent, depth_limit, state_hash, alpha, beta):
+    """
+    Searches one root move in a worker process.
+
+    Args:
+    algorithm (str): The search algorithm to use ('MM' for Minimax, 'AB' for Alpha-Beta).
+    move (int): The cell id the player moves to.
+    opponent (int): The cell id of the opponent.
+    depth_limit (int): The depth at which the search stops.
+    state_hash (int): The hash of the state after the move.
+    alpha (float): Alpha value for Alpha-Beta; ignored by Minimax.
+    beta (float): Beta value for Alpha-Beta; ignored by Minimax.
+
+    Returns:
+    int: The evaluation value of the move.
+    """
+    if algorithm == 'MM':
+        return _worker_search.minimax(move, opponent, 1, False, depth_limit, state_hash)
+    return _worker_search.alpha_beta_pruning(move, opponent, 1, alpha, beta, False, depth_limit, state_hash)
+
+
 class GameSearch:
     """
     GameSearch class provides the search algorithms for solving the maze game.
     It provides methods for Minimax and Alpha-Beta pruning strategies.
     """
-    def __init__(self, maze, goal_position):
+    def __init__(self, maze, goal_position, workers=None):
         """
         Initializes the GameSearch object.
 
         Args:
         maze (maze): The maze object.
         goal_position (tuple): The goal position (row, col) in the maze.
+        workers (int): Number of worker processes to search the root moves in; None or 1 searches them here.
         """
         self.maze = maze
         self.goal_position = goal_position
         self.MAX_DEPTH = 5
+        self.workers = workers or 1
+        self._executor = None
+        self.rows = maze.rows
+        self.cols = maze.cols
+        # Cells are numbered (row - 1) * cols + (col - 1) and the search works on these ids only.
+        self.neighbors = self._build_adjacency()
+        self.goal_id = self.cell_id(goal_position)
+        self.dist = self._goal_distances()
+        # The Python paths index the list. The compiled search reads a dense int32 copy.
+        self._dist = _kernel_array(self.dist, 'int32')
+        # Sort every cell's neighbors nearest-to-goal first once, so the search never sorts moves.
+        self.neighbors = tuple(tuple(sorted(cell_neighbors, key=self.dist.__getitem__))
+                               for cell_neighbors in self.neighbors)
+        # CSR copy of the neighbors for the compiled Alpha-Beta search: the neighbors of
+        # cell i are indices[indptr[i]:indptr[i + 1]].
+        indptr = [0]
+        indices = []
+        for cell_neighbors in self.neighbors:
+            indices.extend(cell_neighbors)
+            indptr.append(len(indices))
+        self.indptr = _kernel_array(indptr)
+        self.indices = _kernel_array(indices)
+        # Zobrist keys: a state hashes to zob_player[player] ^ zob_opponent[opponent], XORed with
+        # zob_side on MAX's turn. A move updates the hash with three XORs. 63 bits keep it an int64.
+        rng = random.Random(0)
+        n_cells = len(self.neighbors)
+        self.zob_player = [rng.getrandbits(63) for _ in range(n_cells)]
+        self.zob_opponent = [rng.getrandbits(63) for _ in range(n_cells)]
+        self.zob_side = rng.getrandbits(63)
+        self._zob_player = _kernel_array(self.zob_player)
+        self._zob_opponent = _kernel_array(self.zob_opponent)
+        # Transposition table: state hash -> (value, flag, depth, best_move), where depth is the
+        # number of plies searched below the state. The value only answers a search of the same depth,
+        # since the distance evaluation leans toward the side that moved last; the best move orders
+        # a search of any depth.
+        # The maze never changes, so entries stay valid from one turn to the next. Both tables have
+        # tt_cap slots; see _new_table and _tt_store for how entries are placed and replaced.
+        self.tt_cap = TT_CAPACITY
+        self.tt = _new_table(self.tt_cap)
+        # Alpha-Beta keeps its own table so the compiled search can use it.
+        self.ab_tt = _kernel_array(_new_table(self.tt_cap))
+        # Killer moves of the compiled search, one per depth, -1 for none.
+        self.killers = _kernel_array([-1] * (self.MAX_DEPTH + 1))
+
+    def close(self):
+        """
+        Shuts down the worker processes, if any were started.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __getstate__(self):
+        """
+        Pickles the search tables for a worker process, leaving out the maze, the pool and the
+        transposition tables. Each worker builds up tables of its own.
+        """
+        state = self.__dict__.copy()
+        for name in ('maze', '_executor', 'tt', 'ab_tt'):
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the search tables pickled by __getstate__ in a worker process, with no maze, no pool
+        and empty transposition tables.
+
+        Args:
+        state (dict): The pickled attributes.
+        """
+        self.__dict__.update(state)
+        self.maze = None
+        self._executor = None
+        self.tt = _new_table(self.tt_cap)
+        self.ab_tt = _kernel_array(_new_table(self.tt_cap))
+
+    def _build_adjacency(self):
+        """
+        Builds the neighbor ids of every cell from the maze map.
+
+        Returns:
+        tuple: For every cell id, a tuple of the ids of the cells it opens into.
+        """
+        rows, cols = self.rows, self.cols
+        adj = [()] * (rows * cols)
+        for (row, col), directions in self.maze.maze_map.items():
+            neighbors = []
+            for direction, (row_to_add, col_to_add) in DIRECTIONS:
+                if directions[direction] == 1:
+                    new_row = row + row_to_add
+                    new_col = col + col_to_add
+                    if 1 <= new_row <= rows and 1 <= new_col <= cols:
+                        neighbors.append(self.cell_id((new_row, new_col)))
+            adj[self.cell_id((row, col))] = tuple(neighbors)
+        return tuple(adj)
 
-    def minimax(self, player, opponent, depth, is_max_turn):
+    def _goal_distances(self):
+        """
+        Computes the maze distance from every cell to the goal by breadth-first search.
+
+        Returns:
+        list: For every cell id, the number of moves to the goal (the number of cells if unreachable).
+        """
+        n_cells = len(self.neighbors)
+        dist = [n_cells] * n_cells
+        dist[self.goal_id] = 0
+        queue = deque([self.goal_id])
+        while queue:
+            cell = queue.popleft()
+            for neighbor in self.neighbors[cell]:
+                if dist[neighbor] == n_cells:
+                    dist[neighbor] = dist[cell] + 1
+                    queue.append(neighbor)
+        return dist
+
+    def cell_id(self, position):
+        """
+        Converts a maze position to its cell id.
+
+        Args:
+        position (tuple): The position (row, col).
+
+        Returns:
+        int: The cell id.
+        """
+        row, col = position
+        return (row - 1) * self.cols + (col - 1)
+
+    def cell_position(self, cell_id):
+        """
+        Converts a cell id back to its maze position.
+
+        Args:
+        cell_id (int): The cell id.
+
+        Returns:
+        tuple: The position (row, col).
+        """
+        row, col = divmod(cell_id, self.cols)
+        return row + 1, col + 1
+
+    def state_hash(self, player, opponent, is_max_turn):
+        """
+        Computes the Zobrist hash of a search state from scratch.
+
+        Args:
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
+        is_max_turn (bool): Flag to indicate if it's the maximizing player's turn.
+
+        Returns:
+        int: The state hash.
+        """
+        state_hash = self.zob_player[player] ^ self.zob_opponent[opponent]
+        return state_hash ^ self.zob_side if is_max_turn else state_hash
+
+    def minimax(self, player, opponent, depth, is_max_turn, depth_limit, state_hash=None):
         """
         Minimax algorithm to find the best move.
 
         Args:
-        player (tuple): The current position of the player (row, col).
-        opponent (tuple): The current position of the opponent (row, col).
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
         depth (int): The current depth in the search tree.
         is_max_turn (bool): Flag to indicate if it's the maximizing player's turn.
+        depth_limit (int): The depth at which the search stops.
+        state_hash (int): The hash of the state, computed from scratch if not given.
 
         Returns:
         int: The evaluation value of the move.
         """
-        if depth == self.MAX_DEPTH or self.is_terminal(player, opponent):
-            return self.utility_function(player, opponent)
+        if state_hash is None:
+            state_hash = self.state_hash(player, opponent, is_max_turn)
+        tt = self.tt
+        tt_probe, tt_store = _tt_probe_py, _tt_store_py
+        neighbors = self.neighbors
+        zob_player, zob_opponent, zob_side = self.zob_player, self.zob_opponent, self.zob_side
+        goal_id = self.goal_id
+        utility = self.utility_function
 
-        if is_max_turn:
-            max_eval = float('-inf')
-            for move in self.get_possible_moves(player):
-                player = move
-                eval = self.minimax(player, opponent, depth + 1, False)
-                max_eval = max(max_eval, eval)
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for move in self.get_possible_moves(player):
-                opponent = move
-                eval = self.minimax(player, opponent, depth + 1, True)
-                min_eval = min(min_eval, eval)
-            return min_eval
+        # The recursion runs on an explicit stack of frames
+        # [is_max_turn, base_hash, move_iterator, best_value, state_hash, depth, player, opponent],
+        # where base_hash is the child hash before the moved side's new cell is XORed in.
+        stack = []
+        node = (player, opponent, depth, is_max_turn, state_hash)
+        while True:
+            # Enter the node: it either has a value right away or becomes a frame.
+            player, opponent, depth, is_max_turn, state_hash = node
+            slot = tt_probe(tt, state_hash, depth_limit - depth)
+            if slot >= 0 and tt[slot + TT_FLAG] == EXACT and tt[slot + TT_DEPTH] == depth_limit - depth:
+                value = tt[slot + TT_VALUE]
+            elif depth == depth_limit or player == goal_id or opponent == goal_id:
+                value = utility(player, opponent)
+            else:
+                if is_max_turn:
+                    stack.append([True, state_hash ^ zob_player[player] ^ zob_side, iter(neighbors[player]),
+                                  float('-inf'), state_hash, depth, player, opponent])
+                else:
+                    stack.append([False, state_hash ^ zob_opponent[opponent] ^ zob_side, iter(neighbors[opponent]),
+                                  float('inf'), state_hash, depth, player, opponent])
+                value = None
 
-    def alpha_beta_pruning(self, player, opponent, depth, alpha, beta, is_max_turn):
+            # Fold finished values into their parents until a frame has a move left to search.
+            node = None
+            while stack:
+                frame = stack[-1]
+                if frame[0]:
+                    if value is not None and value > frame[3]:
+                        frame[3] = value
+                    move = next(frame[2], None)
+                    if move is not None:
+                        node = (move, frame[7], frame[5] + 1, False, frame[1] ^ zob_player[move])
+                        break
+                else:
+                    if value is not None and value < frame[3]:
+                        frame[3] = value
+                    move = next(frame[2], None)
+                    if move is not None:
+                        node = (frame[6], move, frame[5] + 1, True, frame[1] ^ zob_opponent[move])
+                        break
+                stack.pop()
+                value = frame[3]
+                tt_store(tt, frame[4], value, EXACT, depth_limit - frame[5], -1)
+            if node is None:
+                return value
+
+    def alpha_beta_pruning(self, player, opponent, depth, alpha, beta, is_max_turn, depth_limit, state_hash=None):
         """
         Alpha-Beta pruning algorithm to find the best move.
 
         Args:
-        player (tuple): The current position of the player (row, col).
-        opponent (tuple): The current position of the opponent (row, col).
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
         depth (int): The current depth in the search tree.
         alpha (float): Alpha value for pruning.
         beta (float): Beta value for pruning.
         is_max_turn (bool): Flag to indicate if it's the maximizing player's turn.
+        depth_limit (int): The depth at which the search stops.
+        state_hash (int): The hash of the state, computed from scratch if not given.
 
         Returns:
         int: The evaluation value of the move.
         """
-        if depth == self.MAX_DEPTH or self.is_terminal(player, opponent):
-            return self.utility_function(player, opponent)
-
-        if is_max_turn:
-            max_eval = float('-inf')
-            for move in self.get_possible_moves(player):
-                player = move
-                eval = float(self.alpha_beta_pruning(player, opponent, depth + 1, alpha, beta, False))
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-                return max_eval
-        else:
-            min_eval = float('inf')
-            for move in self.get_possible_moves(player):
-                opponent = move
-                eval = self.alpha_beta_pruning(player, opponent, depth + 1, alpha, beta, True)
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            return min_eval
+        if state_hash is None:
+            state_hash = self.state_hash(player, opponent, is_max_turn)
+        if len(self.killers) <= depth_limit:
+            self.killers = _kernel_array([-1] * (depth_limit + 1))
+        return _alpha_beta(player, opponent, state_hash, depth, int(max(alpha, -INF)), int(min(beta, INF)),
+                           is_max_turn, depth_limit, self.indptr, self.indices, self._zob_player, self._zob_opponent,
+                           self.zob_side, self._dist, self.goal_id, self.ab_tt, self.killers)
+
+    def order_moves(self, position, best_move=None):
+        """
+        Orders the moves from a cell best-first for the side making them.
+
+        Both sides race to the same goal, so moves come nearest-to-goal first, as the neighbors are stored.
+        The best move found by an earlier search of the same state is tried first.
+
+        Args:
+        position (int): The cell id of the side to move.
+        best_move (int): The best move stored in the transposition table, if any.
+
+        Returns:
+        list: The cell ids of the moves in the order they should be searched.
+        """
+        moves = list(self.neighbors[position])
+        if best_move in moves:
+            moves.remove(best_move)
+            moves.insert(0, best_move)
+        return moves
 
     def find_best_move(self, player, opponent, algorithm):
         """
@@ -97,81 +611,174 @@ class GameSearch:
         Returns:
         tuple: The best move (row, col).
         """
+        best_move = self.find_best_move_id(self.cell_id(player), self.cell_id(opponent), algorithm)
+        return None if best_move is None else self.cell_position(best_move)
+
+    def find_best_move_id(self, player, opponent, algorithm):
+        """
+        Finds the best move by iterative deepening from depth 1 up to MAX_DEPTH.
+
+        The transposition table is shared by all iterations, so every iteration
+        starts from the best moves found by the shallower ones. Alpha-Beta also searches each
+        iteration with a narrow aspiration window around the previous value and only repeats
+        it with the full window when the value falls outside.
+
+        Args:
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
+        algorithm (str): The search algorithm to use ('MM' for Minimax, 'AB' for Alpha-Beta).
+
+        Returns:
+        int: The cell id of the best move of the deepest completed iteration.
+        """
+        best_move = None
+        value = None
+        for depth_limit in range(1, self.MAX_DEPTH + 1):
+            if algorithm == 'AB' and value is not None:
+                alpha, beta = value - ASPIRATION_WINDOW, value + ASPIRATION_WINDOW
+                best_move, value = self._search_root(player, opponent, depth_limit, algorithm, alpha, beta)
+                if alpha < value < beta:
+                    continue
+            best_move, value = self._search_root(player, opponent, depth_limit, algorithm)
+        return best_move
+
+    def _search_root(self, player, opponent, depth_limit, algorithm, alpha=float('-inf'), beta=float('inf')):
+        """
+        Searches every move of the player to the given depth.
+
+        Args:
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
+        depth_limit (int): The depth at which the search stops.
+        algorithm (str): The search algorithm to use ('MM' for Minimax, 'AB' for Alpha-Beta).
+        alpha (float): Alpha value of the root window for Alpha-Beta.
+        beta (float): Beta value of the root window for Alpha-Beta.
+
+        Returns:
+        tuple: The cell id of the best move and its value. A value at or outside the window
+        is only a bound.
+        """
+        root_hash = self.state_hash(player, opponent, True)
+        slot = _tt_probe_py(self.tt, root_hash, depth_limit)
+        hint = self.tt[slot + TT_MOVE] if slot >= 0 else None
+        # Hash of the state after a move, minus the zob_player term of the destination cell.
+        base_hash = root_hash ^ self.zob_player[player] ^ self.zob_side
+        zob_player = self.zob_player
+        if algorithm == 'MM':
+            search_fn = lambda move, alpha, beta: self.minimax(move, opponent, 1, False, depth_limit,
+                                                               base_hash ^ zob_player[move])
+        elif algorithm == 'AB':
+            search_fn = lambda move, alpha, beta: self.alpha_beta_pruning(move, opponent, 1, alpha, beta, False,
+                                                                          depth_limit, base_hash ^ zob_player[move])
+        else:
+            raise ValueError("Unknown algorithm")
+        moves = self.order_moves(player, hint)
         best_val = float('-inf')
         best_move = None
 
-        for move in self.get_possible_moves(player):
-            if algorithm == 'MM':
-                move_val = self.minimax(player, opponent, 0, False)
-            elif algorithm == 'AB':
-                move_val = self.alpha_beta_pruning(player, opponent, 0, float('-inf'), float('inf'), False)
-            else:
-                raise ValueError("Unknown algorithm")
+        if self.workers > 1 and len(moves) > 1:
+            values = self._search_moves_parallel(moves, opponent, depth_limit, base_hash, algorithm, search_fn,
+                                                 alpha, beta)
+            for move, move_val in zip(moves, values):
+                if move_val > best_val:
+                    best_val = move_val
+                    best_move = move
+        else:
+            for move in moves:
+                move_val = search_fn(move, max(alpha, best_val), beta)
+                if move_val > best_val:
+                    best_val = move_val
+                    best_move = move
+                if move_val >= beta:
+                    break
+        if alpha < best_val < beta:
+            _tt_store_py(self.tt, root_hash, best_val, EXACT, depth_limit, best_move)
+        return best_move, best_val
 
-            if move_val > best_val:
-                best_val = move_val
-                best_move = move
-        return best_move
+    def _search_moves_parallel(self, moves, opponent, depth_limit, base_hash, algorithm, search_fn, alpha, beta):
+        """
+        Searches the root moves in worker processes.
+
+        Minimax sends out every move. Alpha-Beta first searches the best-ordered move here and then
+        sends out its siblings with that value as alpha (Young Brothers Wait): a sibling that cannot
+        beat it comes back at or below alpha, which is all the root needs to rank it. If the first
+        move already reaches beta, its siblings are not searched.
 
-    def utility_function(self, player_position, opponent_position):
+        Args:
+        moves (list): The cell ids of the root moves, best-ordered.
+        opponent (int): The cell id of the opponent.
+        depth_limit (int): The depth at which the search stops.
+        base_hash (int): The hash of the state after a move, minus the zob_player term of the move.
+        algorithm (str): The search algorithm to use ('MM' for Minimax, 'AB' for Alpha-Beta).
+        search_fn (function): Searches a single move in this process.
+        alpha (float): Alpha value of the root window for Alpha-Beta.
+        beta (float): Beta value of the root window for Alpha-Beta.
+
+        Returns:
+        list: The evaluation value of every searched move, in order.
         """
-        Utility function to evaluate the game state.
+        if self._executor is None:
+            # Spawned rather than forked so workers do not inherit the Tk window.
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker, initargs=(self,))
+        values = []
+        if algorithm == 'AB':
+            first_val = search_fn(moves[0], alpha, beta)
+            values.append(first_val)
+            if first_val >= beta:
+                return values
+            alpha = max(alpha, first_val)
+            moves = moves[1:]
+        futures = [self._executor.submit(_search_child, algorithm, move, opponent, depth_limit,
+                                         base_hash ^ self.zob_player[move], alpha, beta)
+                   for move in moves]
+        values.extend(future.result() for future in futures)
+        return values
+
+    def utility_function(self, player, opponent):
+        """
+        Utility function to evaluate the game state: opponent_distance - player_distance.
+
+        Distances are maze distances to the goal. Reaching the goal is worth WIN.
 
         Args:
-        player_position (tuple): The current position of the player (row, col).
-        opponent_position (tuple): The current position of the opponent (row, col).
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
 
         Returns:
         int: The evaluation value of the game state.
         """
-        goal_position = self.goal_position
-        if player_position == goal_position:
-            return 1
-        elif opponent_position == goal_position:
-            return -1
+        goal_id = self.goal_id
+        if player == goal_id:
+            return WIN
+        elif opponent == goal_id:
+            return -WIN
         else:
-            return 0
+            return self.dist[opponent] - self.dist[player]
 
     def is_terminal(self, player, opponent):
         """
         Checks if the game has reached a terminal state.
 
         Args:
-        player (tuple): The current position of the player (row, col).
-        opponent (tuple): The current position of the opponent (row, col).
+        player (int): The cell id of the player.
+        opponent (int): The cell id of the opponent.
 
         Returns:
         bool: True if the game is terminal, False otherwise.
         """
-        goal_position = self.goal_position
-        return player == goal_position or opponent == goal_position
+        goal_id = self.goal_id
+        return player == goal_id or opponent == goal_id
 
-    def get_possible_moves(self, positions):
+    def get_possible_moves(self, pos_id):
         """
-        Gets the possible moves from the current position.
+        Gets the possible moves from the current cell.
 
         Args:
-        positions (tuple): The current position (row, col).
+        pos_id (int): The cell id of the current position.
 
         Returns:
-        list: A list of possible moves (row, col).
-        """
-        curr_row, curr_col = positions
-        direction_map = {
-            'E': (0, 1),
-            'W': (0, -1),
-            'N': (-1, 0),
-            'S': (1, 0)
-        }
-        result = []
-
-        possible_directions = dict(self.maze.maze_map.get((curr_row, curr_col)))
-        for direction, isOpen in possible_directions.items():
-            if isOpen == 1:
-                row_to_add, col_to_add = direction_map.get(direction)
-                new_row = curr_row + row_to_add
-                new_col = curr_col + col_to_add
-                if 1 <= new_row <= self.maze.rows and 1 <= new_col <= self.maze.cols:
-                    result.append((new_row, new_col))
-        return result
-
+        tuple: The cell ids of the possible moves. The same tuple is returned on every call.
+        """
+        return self.neighbors[pos_id]
@@ -62,15 +62,15 @@ def get_human_move(player, search):
         try:
             row = int(input("Enter the row: "))
             col = int(input("Enter the column: "))
-            if 1 <= row <= search.maze.rows and 1 <= col <= search.maze.cols:
-                if (row, col) in search.get_possible_moves((player[0], player[1])):
+            if 1 <= row <= search.rows and 1 <= col <= search.cols:
+                if search.cell_id((row, col)) in search.get_possible_moves(search.cell_id(player)):
                     print("get_human_move ", row, " ", col)
                     return (row, col)
                 else:
                     print("Invalid move. Try again.")
             else:
-                print(f"Invalid input. Enter values between 1 and {search.maze.rows} for row and between 1 "
-                      f"and {search.maze.cols} for column")
+                print(f"Invalid input. Enter values between 1 and {search.rows} for row and between 1 "
+                      f"and {search.cols} for column")
         except ValueError:
             print("Invalid input")
 
@@ -132,7 +132,8 @@ def move_agent(agent, next_move: tuple):
     Returns:
     tuple: The new position of the agent (row, col).
     """
-    return next_move
+    agent.position = next_move
+    return agent.position
 
 
 def main():
@@ -162,50 +163,35 @@ def main():
     node_count = 0
     depth_level = search.MAX_DEPTH
 
+    if player_number == 1:
+        ai_agent, human_agent = max_agent, min_agent
+        ai_role, human_role = "MAX", "MIN"
+    else:
+        ai_agent, human_agent = min_agent, max_agent
+        ai_role, human_role = "MIN", "MAX"
+
     my_maze.run()
     while True:
-        if player_number == 1:
-            # AI is MAX
-            ai_move = move_strategy(max_agent.position, min_agent.position, search)
-            max_agent = move_agent(max_agent, ai_move)
-            visualize_path(my_maze, max_agent, [ai_move])
-            node_count += 1
-
-            if search.is_terminal(max_agent.position, min_agent.position):
-                print("AI (MAX) wins!")
-                break
-
-            print(f"MAX moved: {max_agent.position}")
-            print(f"It is MIN's turn: ")
-            human_move = get_human_move(min_agent.position, search)
-            min_agent = move_agent(min_agent, human_move)
-            print("Human moved")
-            visualize_path(my_maze, min_agent, human_move)
-
-            if search.is_terminal(max_agent.position, min_agent.position):
-                print("Human (MIN) wins!")
-                break
-        else:
-            # AI is MIN
-            ai_move = move_strategy(min_agent.position, max_agent.position, search)
-            min_agent = move_agent(min_agent, ai_move)
-            print("AI move: " + ai_move)
-            visualize_path(my_maze, min_agent, ai_move)
-            node_count += 1
-
-            if search.is_terminal(max_agent.position, min_agent):
-                print("AI (MIN) wins!")
-                break
-
-            print(f"MAX moved: {max_agent.position}")
-            print(f"It is MIN's turn: ")
-            human_move = get_human_move(max_agent.position, search)
-            max_agent = move_agent(max_agent, human_move)
-            visualize_path(my_maze, max_agent, human_move)
-
-            if search.is_terminal(max_agent.position, min_agent):
-                print("Human (MAX) wins!")
-                break
+        ai_move = move_strategy(ai_agent.position, human_agent.position, search)
+        move_agent(ai_agent, ai_move)
+        print("AI move:", ai_move)
+        visualize_path(my_maze, ai_agent, ai_move)
+        node_count += 1
+
+        if search.is_terminal(search.cell_id(ai_agent.position), search.cell_id(human_agent.position)):
+            print(f"AI ({ai_role}) wins!")
+            break
+
+        print(f"{ai_role} moved: {ai_agent.position}")
+        print(f"It is {human_role}'s turn: ")
+        human_move = get_human_move(human_agent.position, search)
+        move_agent(human_agent, human_move)
+        print("Human moved")
+        visualize_path(my_maze, human_agent, human_move)
+
+        if search.is_terminal(search.cell_id(ai_agent.position), search.cell_id(human_agent.position)):
+            print(f"Human ({human_role}) wins!")
+            break
 
     # Write README.txt
     with open("README.txt", "w") as file: